@@ -70,10 +70,10 @@ class TestHostnameToIp(unittest.TestCase):
 @unittest.skipIf(failed_import,
                  "Could not import extraction. Skipping related tests.")
 class TestExtraction(unittest.TestCase):
-    def setUp(self):
-        self.logfile = join(dirname(abspath(__file__)), "test.log")
-        log_content = "A,B\n1,0\n0,1\n1,0\n0,1\n0,1\n0,1\n0,1\n1,0\n1,0\n1,0\n"
-        self.expected = (
+    @classmethod
+    def setUpClass(cls):
+        cls.logfile = join(dirname(abspath(__file__)), "test.log")
+        cls.expected = (
             "A,B\n"
             "7.422860000e-04,7.294520000e-04\n"
             "6.803650000e-04,9.062010000e-04\n"
@@ -85,19 +85,11 @@ class TestExtraction(unittest.TestCase):
             "6.535040000e-04,6.920560000e-04\n"
             "6.573940000e-04,6.549630000e-04\n"
             "7.749390000e-04,9.787030000e-04\n")
-        self.time_vals = "\n".join(["some random header"] +
-                                   list(str(i) for i in range(20)))
-        # fix mock not supporting iterators
-        self.mock_log = mock.mock_open(read_data=log_content)
-        self.mock_log.return_value.__iter__ = lambda s: iter(s.readline, '')
-
-        with mock.patch('__main__.__builtins__.open', self.mock_log):
-            self.log = Log(self.logfile)
-            self.log.read_log()
-
-        self.builtin_open = open
+        cls.time_vals = "\n".join(["some random header"] +
+                                  list(str(i) for i in range(20)))
+        cls.builtin_open = open
 
-        self.expected_raw = (
+        cls.expected_raw = (
             "raw times\n"
             "12354\n"
             "65468\n"
@@ -120,7 +112,7 @@ class TestExtraction(unittest.TestCase):
             "56487\n"
             "21313\n")
 
-        self.expected_binary_conv = (
+        cls.expected_binary_conv = (
             "A,B\n"
             "6.546800000e+04,1.235400000e+04\n"
             "2.123500000e+04,4.562300000e+04\n"
@@ -134,7 +126,7 @@ class TestExtraction(unittest.TestCase):
             "2.131300000e+04,5.648700000e+04\n"
             )
 
-        self.expected_no_quickack = (
+        cls.expected_no_quickack = (
             "A,B\n"
             "7.581300000e-04,7.470090000e-04\n"
             "6.967180000e-04,9.204620000e-04\n"
@@ -148,6 +140,12 @@ class TestExtraction(unittest.TestCase):
             "7.909350000e-04,9.927330000e-04\n"
             )
 
+    def setUp(self):
+        # the Log object keeps the position in the file, so it can't be
+        # shared between tests
+        self.log = Log(self.logfile)
+        self.log.read_log()
+
     def file_selector(self, *args, **kwargs):
         name = args[0]
         mode = args[1]
@@ -5,13 +5,6 @@ try:
 except ImportError:
     import unittest
 
-try:
-    import mock
-    from mock import call
-except ImportError:
-    import unittest.mock as mock
-    from unittest.mock import call
-
 
 from tlsfuzzer.helpers import sig_algs_to_ids, key_share_gen, psk_ext_gen, \
         flexible_getattr, psk_session_ext_gen, key_share_ext_gen, \
@@ -23,63 +16,52 @@ from tlslite.extensions import KeyShareEntry, PreSharedKeyExtension, \
         PskIdentity, ClientKeyShareExtension
 from tlslite.constants import GroupName, CipherSuite
 from tlslite.messages import NewSessionTicket
+from tlslite.utils.cryptomath import numberToByteArray
 
 class TestSigAlgsToIds(unittest.TestCase):
-    def test_with_empty(self):
-        ret = sig_algs_to_ids("")
+    CASES = (("", []),
+             ("sha256+rsa", [(4, 1)]),
+             ("15+22", [(15, 22)]),
+             ("rsa_pss_pss_sha256", [(8, 9)]),
+             ("rsa_pss_pss_sha256 sha512+0", [(8, 9), (6, 0)]))
 
-        self.assertEqual(ret, [])
+    def test_conversion(self):
+        for names, expected in self.CASES:
+            with self.subTest(names=names):
+                self.assertEqual(sig_algs_to_ids(names), expected)
 
-    def test_with_legacy(self):
-        ret = sig_algs_to_ids("sha256+rsa")
+    def test_many_sig_algs(self):
+        ret = sig_algs_to_ids(" ".join(["sha256+rsa",
+                                        "rsa_pss_pss_sha256",
+                                        "6+3"] * 1000))
 
-        self.assertEqual(ret, [(4, 1)])
+        self.assertEqual(ret, [(4, 1), (8, 9), (6, 3)] * 1000)
 
-    def test_with_numerical(self):
-        ret = sig_algs_to_ids("15+22")
+    def test_with_unknown_hash_name(self):
+        with self.assertRaises(AttributeError):
+            sig_algs_to_ids("sha3+rsa")
 
-        self.assertEqual(ret, [(15, 22)])
+    def test_with_unknown_signature_name(self):
+        with self.assertRaises(AttributeError):
+            sig_algs_to_ids("sha256+ecdh")
 
-    def tes_with_mixed(self):
+    def test_with_mixed(self):
         ret = sig_algs_to_ids("15+rsa")
 
         self.assertEqual(ret, [(15, 1)])
 
-    def test_with_signature_scheme(self):
-        ret = sig_algs_to_ids("rsa_pss_pss_sha256")
-
-        self.assertEqual(ret, [(8, 9)])
-
-    def test_multiple_values(self):
-        ret = sig_algs_to_ids("rsa_pss_pss_sha256 sha512+0")
-        self.assertEqual(ret, [(8, 9), (6, 0)])
-
 
 class TestExtNamesToIds(unittest.TestCase):
-    def test_with_empty(self):
-        ret = ext_names_to_ids("")
-
-        self.assertEqual(ret, [])
-
-    def test_with_name(self):
-        ret = ext_names_to_ids("server_name")
-
-        self.assertEqual(ret, [0])
-
-    def test_with_id(self):
-        ret = ext_names_to_ids("0")
-
-        self.assertEqual(ret, [0])
-
-    def test_with_two_ids(self):
-        ret = ext_names_to_ids("0 1")
+    CASES = (("", []),
+             ("server_name", [0]),
+             ("0", [0]),
+             ("0 1", [0, 1]),
+             ("0 heartbeat", [0, 15]))
 
-        self.assertEqual(ret, [0, 1])
-
-    def test_with_id_and_name(self):
-        ret = ext_names_to_ids("0 heartbeat")
-
-        self.assertEqual(ret, [0, 15])
+    def test_conversion(self):
+        for names, expected in self.CASES:
+            with self.subTest(names=names):
+                self.assertEqual(ext_names_to_ids(names), expected)
 
     def test_with_unrecognised_name(self):
         with self.assertRaises(AttributeError):
@@ -87,25 +69,15 @@ class TestExtNamesToIds(unittest.TestCase):
 
 
 class TestClientCertTypesToIds(unittest.TestCase):
-    def test_with_empty(self):
-        ret = client_cert_types_to_ids("")
-
-        self.assertEqual(ret, [])
-
-    def test_with_one(self):
-        ret = client_cert_types_to_ids("rsa_sign")
+    CASES = (("", []),
+             ("rsa_sign", [1]),
+             ("rsa_sign ecdsa_sign", [1, 64]),
+             ("1 ecdsa_sign", [1, 64]))
 
-        self.assertEqual(ret, [1])
-
-    def test_with_two(self):
-        ret = client_cert_types_to_ids("rsa_sign ecdsa_sign")
-
-        self.assertEqual(ret, [1, 64])
-
-    def test_with_mixed(self):
-        ret = client_cert_types_to_ids("1 ecdsa_sign")
-
-        self.assertEqual(ret, [1, 64])
+    def test_conversion(self):
+        for names, expected in self.CASES:
+            with self.subTest(names=names):
+                self.assertEqual(client_cert_types_to_ids(names), expected)
 
     def test_with_malformed_integer(self):
         with self.assertRaises(AttributeError):
@@ -131,6 +103,31 @@ class TestKeyShareGen(unittest.TestCase):
         self.assertEqual(ret.group, GroupName.secp256r1)
         self.assertEqual(len(ret.key_exchange), 256 // 8 * 2 + 1)
 
+    def test_with_all_tls13_groups(self):
+        # group and size of its key share in TLS 1.3
+        groups = ((GroupName.ffdhe2048, 2048 // 8),
+                  (GroupName.ffdhe3072, 3072 // 8),
+                  (GroupName.ffdhe4096, 4096 // 8),
+                  (GroupName.ffdhe6144, 6144 // 8),
+                  (GroupName.ffdhe8192, 8192 // 8),
+                  (GroupName.secp256r1, 256 // 8 * 2 + 1),
+                  (GroupName.secp384r1, 384 // 8 * 2 + 1),
+                  (GroupName.secp521r1, 66 * 2 + 1),
+                  (GroupName.brainpoolP256r1tls13, 256 // 8 * 2 + 1),
+                  (GroupName.brainpoolP384r1tls13, 384 // 8 * 2 + 1),
+                  (GroupName.brainpoolP512r1tls13, 512 // 8 * 2 + 1),
+                  (GroupName.x25519, 32),
+                  (GroupName.x448, 56))
+
+        for group, size in groups:
+            ret = key_share_gen(group)
+
+            self.assertIsInstance(ret, KeyShareEntry)
+            self.assertEqual(ret.group, group)
+            self.assertEqual(len(ret.key_exchange), size,
+                             "Wrong key share size for {0}".format(
+                                 GroupName.toStr(group)))
+
 
 class TestPskExtGen(unittest.TestCase):
     def test_gen(self):
@@ -175,12 +172,17 @@ class TestPskExtGen(unittest.TestCase):
 
 
 class TestPskSessionExtGen(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # the generator only reads the ticket, so it can be shared
+        cls.ticket = NewSessionTicket().create(
+            134, 0, bytearray(b'nonce'), bytearray(b'ticket value'), [])
+        cls.ticket.time = 1214
+
     def test_gen(self):
         state = ConnectionState()
         state.cipher = CipherSuite.TLS_AES_256_GCM_SHA384
-        state.session_tickets = [NewSessionTicket().create(
-            134, 0, bytearray(b'nonce'), bytearray(b'ticket value'), [])]
-        state.session_tickets[0].time = 1214
+        state.session_tickets = [self.ticket]
 
         gen = psk_session_ext_gen()
         psk = gen(state)
@@ -193,9 +195,7 @@ class TestPskSessionExtGen(unittest.TestCase):
     def test_gen_with_psk_binders(self):
         state = ConnectionState()
         state.cipher = CipherSuite.TLS_AES_256_GCM_SHA384
-        state.session_tickets = [NewSessionTicket().create(
-            134, 0, bytearray(b'nonce'), bytearray(b'ticket value'), [])]
-        state.session_tickets[0].time = 1214
+        state.session_tickets = [self.ticket]
 
         config = [(b'test', b'secret', 'sha256'),
                   (b'example', b'secret', 'sha384')]
@@ -245,14 +245,14 @@ class TestKeyShareExtGen(unittest.TestCase):
 
 
 class TestFlexibleGetattr(unittest.TestCase):
-    def test_with_number(self):
-        self.assertEqual(12, flexible_getattr("12", None))
-
-    def test_with_none(self):
-        self.assertIsNone(flexible_getattr("none", GroupName))
+    CASES = (("12", None, 12),
+             ("none", GroupName, None),
+             ("secp384r1", GroupName, 24))
 
-    def test_with_name(self):
-        self.assertEqual(24, flexible_getattr("secp384r1", GroupName))
+    def test_conversion(self):
+        for val, val_type, expected in self.CASES:
+            with self.subTest(val=val):
+                self.assertEqual(expected, flexible_getattr(val, val_type))
 
     def test_with_invalid_name(self):
         with self.assertRaises(AttributeError):
@@ -287,6 +287,19 @@ class TestUniquenessCheck(unittest.TestCase):
             uniqueness_check({'bytearrays':
                              [bytearray(b'a'), bytearray(b'a')]}, 2))
 
+    def test_with_many_bytearrays(self):
+        values = [numberToByteArray(i, 2) for i in range(100)]
+
+        self.assertEqual([], uniqueness_check({'bytearrays': values}, 100))
+
+    def test_with_many_bytearrays_and_one_duplicate(self):
+        values = [numberToByteArray(i, 2) for i in range(100)]
+        values.append(bytearray(values[50]))
+
+        self.assertEqual(
+            ["Duplicated entries in 'bytearrays'."],
+            uniqueness_check({'bytearrays': values}, 101))
+
 
 class TestAutoEmptyExtension(unittest.TestCase):
     def test_equality(self):
@@ -308,41 +321,32 @@ class TestAutoEmptyExtension(unittest.TestCase):
 
 
 class TestProtocolNameToTuple(unittest.TestCase):
-    def test_sslv2(self):
-        self.assertEqual((0, 2), protocol_name_to_tuple("SSLv2"))
-
-    def test_ssl2(self):
-        self.assertEqual((0, 2), protocol_name_to_tuple("SSL2"))
-
-    def test_sslv3(self):
-        self.assertEqual((3, 0), protocol_name_to_tuple("SSLv3"))
-
-    def test_ssl3(self):
-        self.assertEqual((3, 0), protocol_name_to_tuple("SSL3"))
-
-    def test_tlsv10(self):
-        self.assertEqual((3, 1), protocol_name_to_tuple("TLSv1.0"))
-
-    def test_tls10(self):
-        self.assertEqual((3, 1), protocol_name_to_tuple("TLS1.0"))
-
-    def test_tlsv11(self):
-        self.assertEqual((3, 2), protocol_name_to_tuple("TLSv1.1"))
-
-    def test_tls11(self):
-        self.assertEqual((3, 2), protocol_name_to_tuple("TLS1.1"))
-
-    def test_tlsv12(self):
-        self.assertEqual((3, 3), protocol_name_to_tuple("TLSv1.2"))
-
-    def test_tls12(self):
-        self.assertEqual((3, 3), protocol_name_to_tuple("TLS1.2"))
-
-    def test_tlsv13(self):
-        self.assertEqual((3, 4), protocol_name_to_tuple("TLSv1.3"))
-
-    def test_tls13(self):
-        self.assertEqual((3, 4), protocol_name_to_tuple("TLS1.3"))
+    CASES = (("SSLv2", (0, 2)),
+             ("SSL2", (0, 2)),
+             ("SSLv3", (3, 0)),
+             ("SSL3", (3, 0)),
+             ("3.0", (3, 0)),
+             ("TLS 1.0", (3, 1)),
+             ("TLSv1.0", (3, 1)),
+             ("TLS1.0", (3, 1)),
+             ("1.0", (3, 1)),
+             ("TLS 1.1", (3, 2)),
+             ("TLSv1.1", (3, 2)),
+             ("TLS1.1", (3, 2)),
+             ("1.1", (3, 2)),
+             ("TLS 1.2", (3, 3)),
+             ("TLSv1.2", (3, 3)),
+             ("TLS1.2", (3, 3)),
+             ("1.2", (3, 3)),
+             ("TLS 1.3", (3, 4)),
+             ("TLSv1.3", (3, 4)),
+             ("TLS1.3", (3, 4)),
+             ("1.3", (3, 4)))
+
+    def test_conversion(self):
+        for name, expected in self.CASES:
+            with self.subTest(name=name):
+                self.assertEqual(expected, protocol_name_to_tuple(name))
 
     def test_unknown(self):
         with self.assertRaises(ValueError):
@@ -350,6 +354,12 @@ class TestProtocolNameToTuple(unittest.TestCase):
 
 
 class TestExpectedExtParser(unittest.TestCase):
+    # specification and the messages with non-empty extension lists
+    CASES = (("", {}),
+             ("server_name:CH", {'CH': [0]}),
+             ("22:CH:SH", {'CH': [22], 'SH': [22]}),
+             ("server_name:CH 22:CH", {'CH': [0, 22]}))
+
     def setUp(self):
         self.exp = {'CH': [],
                     'SH': [],
@@ -359,32 +369,13 @@ class TestExpectedExtParser(unittest.TestCase):
                     'NST': [],
                     'HRR': []}
 
-    def test_empty(self):
-        ret = expected_ext_parser("")
-
-        self.assertEqual(ret, self.exp)
-
-    def test_server_name_in_CH(self):
-        ret = expected_ext_parser("server_name:CH")
-
-        self.exp['CH'] = [0]
+    def test_conversion(self):
+        for names, non_empty in self.CASES:
+            with self.subTest(names=names):
+                exp = dict(self.exp)
+                exp.update(non_empty)
 
-        self.assertEqual(ret, self.exp)
-
-    def test_numeric_id_in_CH_and_SH(self):
-        ret = expected_ext_parser("22:CH:SH")
-
-        self.exp['CH'] = [22]
-        self.exp['SH'] = [22]
-
-        self.assertEqual(ret, self.exp)
-
-    def test_two_extensions_in_CH(self):
-        ret = expected_ext_parser("server_name:CH 22:CH")
-
-        self.exp['CH'] = [0, 22]
-
-        self.assertEqual(ret, self.exp)
+                self.assertEqual(expected_ext_parser(names), exp)
 
     def test_missing_colon(self):
         with self.assertRaises(ValueError):
@@ -435,6 +426,21 @@ class TestDictUpdateNotPresent(unittest.TestCase):
 
         self.assertEqual(ret, {"some": None, "keys": None})
 
+    def test_large_key_list(self):
+        keys = ["k{0}".format(i) for i in range(100)]
+        ret = dict_update_non_present(None, keys)
+
+        self.assertEqual(len(ret), 100)
+
+    def test_large_key_list_with_duplicate(self):
+        keys = ["k{0}".format(i) for i in range(100)]
+        keys.append("k99")
+
+        with self.assertRaises(ValueError) as e:
+            dict_update_non_present(None, keys)
+
+        self.assertIn("k99", str(e.exception))
+
     def test_duplicated_keys(self):
         with self.assertRaises(ValueError) as e:
             dict_update_non_present(None, ["duplicated_key", "duplicated_key"])
@@ -450,20 +456,30 @@ class TestDictUpdateNotPresent(unittest.TestCase):
 
 
 class TestPadOrTruncateSignature(unittest.TestCase):
-    def test_with_truncation(self):
-        cal = pad_or_truncate_signature(lambda a, b, c, d: b'xxx000', -3)
+    # signature, modification length, pad byte and expected result
+    CASES = ((b'xxx000', -3, None, bytearray(b'xxx')),
+             (b'xxx', 3, b'0', bytearray(b'xxx000')),
+             (b'xxx', 1, 0, bytearray(b'xxx\x00')))
 
-        self.assertEqual(cal(None, None, None, None), bytearray(b'xxx'))
+    def test_modification(self):
+        for sig, length, pad_byte, expected in self.CASES:
+            with self.subTest(sig=sig, length=length, pad_byte=pad_byte):
+                cal = pad_or_truncate_signature(lambda a, b, c, d: sig,
+                                                length, pad_byte)
 
-    def test_with_pad_byte(self):
-        cal = pad_or_truncate_signature(lambda a, b, c, d: b'xxx', 3, b'0')
+                self.assertEqual(cal(None, None, None, None), expected)
 
-        self.assertEqual(cal(None, None, None, None), bytearray(b'xxx000'))
+    def test_repeated_padding(self):
+        cal = pad_or_truncate_signature(lambda a, b, c, d: b'xxx', 3, b'0')
 
-    def test_with_pad_int(self):
-        cal = pad_or_truncate_signature(lambda a, b, c, d: b'xxx', 1, 0)
+        ret1 = cal(None, None, None, None)
+        ret2 = cal(None, None, None, None)
+        # the precomputed padding must not leak through the returned values
+        ret1[3:] = b'yyy'
 
-        self.assertEqual(cal(None, None, None, None), bytearray(b'xxx\x00'))
+        self.assertEqual(ret1, bytearray(b'xxxyyy'))
+        self.assertEqual(ret2, bytearray(b'xxx000'))
+        self.assertEqual(cal(None, None, None, None), bytearray(b'xxx000'))
 
     def test_wrong_modify_length(self):
         with self.assertRaises(ValueError) as e:
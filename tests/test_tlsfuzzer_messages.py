@@ -108,6 +108,18 @@ ecdsa_key = keyfactory.parsePEMKey(
     private=True)
 
 
+_ecdsa_keys = {}
+
+
+def get_ecdsa_key(curve_name, secret_multiplier):
+    """Return ECDSA key with given parameters, create it only on first use."""
+    key = _ecdsa_keys.get((curve_name, secret_multiplier))
+    if key is None:
+        key = Python_ECDSAKey(None, None, curve_name, secret_multiplier)
+        _ecdsa_keys[(curve_name, secret_multiplier)] = key
+    return key
+
+
 class TestClose(unittest.TestCase):
     def test___init__(self):
         close = Close()
@@ -2051,7 +2063,17 @@ class TestCertificateVerifyGenerator(unittest.TestCase):
 class TestCertificateVerifyGeneratorECDSA(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
-        cls.priv_key = Python_ECDSAKey(None, None, "NIST256p", 12)
+        cls.priv_key = get_ecdsa_key("NIST256p", 12)
+        # the TLS 1.3 signatures in tests are made over empty transcript
+        # so the signed data is the same in all of them
+        cls.verify_bytes = bytes(KeyExchange.calcVerifyBytes(
+                (3, 4),
+                HandshakeHashes(),
+                constants.SignatureScheme.ecdsa_secp256r1_sha256,
+                b'',
+                b'',
+                b'',
+                "sha256"))
 
     def test_generate_with_ecdsa_and_no_cert_req_in_tls1_3(self):
         priv_key = self.priv_key
@@ -2067,17 +2089,8 @@ class TestCertificateVerifyGeneratorECDSA(unittest.TestCase):
                          (constants.HashAlgorithm.sha256,
                           constants.SignatureAlgorithm.ecdsa))
 
-        verif_bytes = KeyExchange.calcVerifyBytes(
-                (3, 4),
-                state.handshake_hashes,
-                constants.SignatureScheme.ecdsa_secp256r1_sha256,
-                b'',
-                b'',
-                b'',
-                "sha256")
-
         self.assertTrue(priv_key.verify(
-            msg.signature, verif_bytes,
+            msg.signature, self.verify_bytes,
             "", "sha256"))
 
     def test_generate_with_ecdsa_cert_and_no_key_in_tls1_3(self):
@@ -2222,17 +2235,8 @@ class TestCertificateVerifyGeneratorECDSA(unittest.TestCase):
                          (constants.HashAlgorithm.sha256,
                           constants.SignatureAlgorithm.ecdsa))
 
-        verif_bytes = KeyExchange.calcVerifyBytes(
-                (3, 4),
-                state.handshake_hashes,
-                constants.SignatureScheme.ecdsa_secp256r1_sha256,
-                b'',
-                b'',
-                b'',
-                "sha256")
-
         self.assertTrue(priv_key.verify(
-            msg.signature, verif_bytes,
+            msg.signature, self.verify_bytes,
             "", "sha256"))
 
     def test_generate_with_ecdsa_256_alg_and_non_matching_CR_tls1_2(self):
@@ -2259,7 +2263,7 @@ class TestCertificateVerifyGeneratorECDSA(unittest.TestCase):
             "", "sha512"))
 
     def test_generate_with_ecdsa_384_alg(self):
-        priv_key = Python_ECDSAKey(None, None, "NIST384p", 11)
+        priv_key = get_ecdsa_key("NIST384p", 11)
         cert_ver_g = CertificateVerifyGenerator(priv_key)
         state = ConnectionState()
         state.version = (3, 3)
@@ -2287,7 +2291,7 @@ class TestCertificateVerifyGeneratorECDSA(unittest.TestCase):
             "", "sha512"))
 
     def test_generate_with_ecdsa_521_alg(self):
-        priv_key = Python_ECDSAKey(None, None, "NIST521p", 10)
+        priv_key = get_ecdsa_key("NIST521p", 10)
         cert_ver_g = CertificateVerifyGenerator(priv_key)
         state = ConnectionState()
         state.version = (3, 3)
@@ -2333,21 +2337,12 @@ class TestCertificateVerifyGeneratorECDSA(unittest.TestCase):
         self.assertEqual(msg.signatureAlgorithm,
                          constants.SignatureScheme.ecdsa_secp256r1_sha256)
 
-        verif_bytes = KeyExchange.calcVerifyBytes(
-                (3, 4),
-                state.handshake_hashes,
-                constants.SignatureScheme.ecdsa_secp256r1_sha256,
-                b'',
-                b'',
-                b'',
-                "sha256")
-
         self.assertTrue(priv_key.verify(
-            msg.signature, verif_bytes,
+            msg.signature, self.verify_bytes,
             "", "sha256"))
 
     def test_generate_with_ecdsa_384_alg(self):
-        priv_key = Python_ECDSAKey(None, None, "NIST384p", 11)
+        priv_key = get_ecdsa_key("NIST384p", 11)
         cert_ver_g = CertificateVerifyGenerator(priv_key)
         state = ConnectionState()
         state.version = (3, 4)
@@ -2380,7 +2375,7 @@ class TestCertificateVerifyGeneratorECDSA(unittest.TestCase):
             "", "sha384"))
 
     def test_generate_with_ecdsa_521_alg(self):
-        priv_key = Python_ECDSAKey(None, None, "NIST521p", 10)
+        priv_key = get_ecdsa_key("NIST521p", 10)
         cert_ver_g = CertificateVerifyGenerator(priv_key)
         state = ConnectionState()
         state.version = (3, 4)
@@ -14,9 +14,15 @@ except ImportError:
     from unittest.mock import call
 
 import sys
-from tlsfuzzer.runner import ConnectionState, Runner, guess_response
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+from tlsfuzzer.runner import ConnectionState, Runner, guess_response, \
+        run_conversations
 from tlsfuzzer.expect import ExpectClose, ExpectNoMessage
-from tlsfuzzer.messages import ClientHelloGenerator
+from tlsfuzzer.messages import ClientHelloGenerator, ResetHandshakeHashes
+from tlsfuzzer.tree import TreeNode
 import tlslite.messages as messages
 import tlslite.constants as constants
 from tlslite.x509certchain import X509CertChain
@@ -426,3 +432,93 @@ class TestGuessResponse(unittest.TestCase):
 
         self.assertEqual("Handshake(server_hello)",
                          guess_response(content_type, data, ssl2=True))
+
+
+class TestRunConversations(unittest.TestCase):
+    def setUp(self):
+        self.passing = ResetHandshakeHashes()
+        # the base node doesn't implement the methods Runner needs
+        self.failing = TreeNode()
+
+    def run_conversations(self, tests, jobs, full_traceback=lambda: True):
+        with mock.patch("sys.stdout", new_callable=StringIO) as out:
+            results = list(run_conversations(tests, jobs, full_traceback))
+        return results, out.getvalue().splitlines()
+
+    def test_sequential(self):
+        results, output = self.run_conversations(
+            [("pass", self.passing), ("fail", self.failing)], 1)
+
+        self.assertEqual(results[0], ("pass", True, None, None))
+        name, res, exception, trace = results[1]
+        self.assertEqual(name, "fail")
+        self.assertFalse(res)
+        self.assertEqual(exception, "Subclasses need to implement this!")
+        self.assertIn("Traceback", trace)
+        self.assertIn("NotImplementedError", trace)
+        self.assertEqual(output[:2], ["pass ...", "fail ..."])
+        self.assertIn("Error encountered while processing node", output[2])
+
+    def test_sequential_does_not_create_pool(self):
+        with mock.patch("tlsfuzzer.runner._fork_pool") as fork_pool:
+            self.run_conversations(
+                [("pass", self.passing), ("fail", self.failing)], 1)
+
+        fork_pool.assert_not_called()
+
+    def test_parallel_without_fork(self):
+        with mock.patch("tlsfuzzer.runner._fork_pool",
+                        return_value=None) as fork_pool:
+            results, output = self.run_conversations(
+                [("pass", self.passing), ("fail", self.failing)], 4)
+
+        fork_pool.assert_called_once_with(2)
+        self.assertEqual([(i[0], i[1]) for i in results],
+                         [("pass", True), ("fail", False)])
+        self.assertEqual(output[:2], ["pass ...", "fail ..."])
+        self.assertIn("Error encountered while processing node", output[2])
+
+    def test_parallel_results_in_order(self):
+        tests = [("test {0}".format(i), self.failing if i % 3 else
+                  self.passing) for i in range(9)]
+
+        results, _ = self.run_conversations(tests, 3)
+
+        self.assertEqual([(i[0], i[1]) for i in results],
+                         [(name, conv is self.passing)
+                          for name, conv in tests])
+
+    def test_parallel_output_under_test_name(self):
+        results, output = self.run_conversations(
+            [("fail 1", self.failing), ("pass", self.passing),
+             ("fail 2", self.failing)], 3)
+
+        self.assertEqual(len(results), 3)
+        self.assertEqual(len(output), 5)
+        self.assertEqual(output[0], "fail 1 ...")
+        self.assertIn("Error encountered while processing node", output[1])
+        self.assertEqual(output[2:4], ["pass ...", "fail 2 ..."])
+        self.assertIn("Error encountered while processing node", output[4])
+
+    def check_traceback_selection(self, jobs):
+        # only the first failure is described with full traceback
+        full_traceback = mock.Mock(side_effect=[True, False])
+
+        results, _ = self.run_conversations(
+            [("fail 1", self.failing), ("fail 2", self.failing)], jobs,
+            full_traceback)
+
+        self.assertIn("Traceback", results[0][3])
+        self.assertEqual(results[1][3],
+                         "NotImplementedError: "
+                         "Subclasses need to implement this!")
+
+    def test_sequential_traceback_selection(self):
+        self.check_traceback_selection(1)
+
+    def test_parallel_traceback_selection(self):
+        self.check_traceback_selection(2)
+
+    def test_parallel_traceback_selection_without_fork(self):
+        with mock.patch("tlsfuzzer.runner._fork_pool", return_value=None):
+            self.check_traceback_selection(2)
@@ -32,6 +32,26 @@ class TestTreeNode(unittest.TestCase):
         self.assertIs(child, ret)
         self.assertIs(node.child, child)
 
+    def test_add_children(self):
+        node = TreeNode()
+        child = TreeNode()
+        grandchild = TreeNode()
+
+        ret = node.add_children([child, grandchild])
+
+        self.assertIs(grandchild, ret)
+        self.assertIs(node.child, child)
+        self.assertIs(child.child, grandchild)
+        self.assertIsNone(grandchild.child)
+
+    def test_add_children_with_no_children(self):
+        node = TreeNode()
+
+        ret = node.add_children([])
+
+        self.assertIs(node, ret)
+        self.assertIsNone(node.child)
+
     def test_get_all_siblings(self):
         node = TreeNode()
 
@@ -2,13 +2,14 @@
 # Released under Gnu GPL v2.0, see LICENSE file for details
 
 from __future__ import print_function
-import traceback
 import sys
 import getopt
+import time
+from copy import deepcopy
 from itertools import chain
 from random import sample
 
-from tlsfuzzer.runner import Runner
+from tlsfuzzer.runner import run_conversations
 from tlsfuzzer.messages import Connect, ClientHelloGenerator, \
         ClientKeyExchangeGenerator, ChangeCipherSpecGenerator, \
         FinishedGenerator, ApplicationDataGenerator, AlertGenerator, \
@@ -27,7 +28,19 @@ from tlsfuzzer.utils.lists import natural_sort_keys
 from tlsfuzzer.helpers import SIG_ALL, cipher_suite_to_id
 
 
-version = 7
+version = 8
+
+
+GET_REQUEST_LINE = b"GET /?Renegotiation_Test=tlsfuzzer HTTP/1.0\r\n"
+GET_REQUEST_END = b"\r\n"
+GET_REQUEST = GET_REQUEST_LINE + GET_REQUEST_END
+
+# time (in seconds) after which the final sanity test is run even with --fast
+FAST_SANITY_TIMEOUT = 60
+
+# number of failures for which the full traceback is printed, unless
+# --verbose is used
+MAX_TRACEBACKS = 5
 
 
 def help_msg():
@@ -52,9 +65,123 @@ def help_msg():
     print(" -C ciph        Use specified ciphersuite. Either numerical value or")
     print("                IETF name.")
     print(" --no-renego-close expect a connection close, after no_renego alert")
+    print(" --jobs num     run up to 'num' conversations in parallel, 1 by")
+    print("                default. \"sanity\" tests are always run alone.")
+    print("                Requires the \"fork\" multiprocessing start method,")
+    print("                conversations are run one by one when it's unavailable")
+    print(" --fast         run the final \"sanity\" test only if other tests")
+    print("                failed or if they took more than {0} seconds"
+          .format(FAST_SANITY_TIMEOUT))
+    print(" -v, --verbose  print the full traceback of every failure, by default")
+    print("                only the first {0} failures include it. With --jobs"
+          .format(MAX_TRACEBACKS))
+    print("                the tracebacks are still formatted for every failure,")
+    print("                in the worker processes, only their printing is limited")
     print(" --help         this message")
 
 
+def client_hello_extensions(dhe, renego):
+    """
+    Create the extensions sent in Client Hello.
+
+    :param bool dhe: whether to advertise support for (EC)DHE key exchange
+    :param bool renego: whether to send the renegotiation_info extension
+    :return: dictionary of extensions or None when none are needed
+    """
+    if not dhe and not renego:
+        return None
+    ext = {}
+    if dhe:
+        groups = [GroupName.secp256r1,
+                  GroupName.ffdhe2048]
+        ext[ExtensionType.supported_groups] = SupportedGroupsExtension()\
+            .create(groups)
+        ext[ExtensionType.signature_algorithms] = \
+            SignatureAlgorithmsExtension().create(SIG_ALL)
+        ext[ExtensionType.signature_algorithms_cert] = \
+            SignatureAlgorithmsCertExtension().create(SIG_ALL)
+    if renego:
+        ext[ExtensionType.renegotiation_info] = None
+    return ext
+
+
+def build_conn_graph(host, port, ciphers, dhe, renego):
+    """
+    Create the initial handshake, shared by all the conversations.
+
+    :return: tuple with the root of the conversation and its last node
+    """
+    conversation = Connect(host, port)
+    node = conversation
+    node = node.add_child(ClientHelloGenerator(
+        ciphers, extensions=client_hello_extensions(dhe, renego)))
+    if renego:
+        ext = {ExtensionType.renegotiation_info: None}
+    else:
+        ext = None
+    node = node.add_children([ExpectServerHello(extensions=ext),
+                              ExpectCertificate()])
+    if dhe:
+        node = node.add_child(ExpectServerKeyExchange())
+    node = node.add_children([ExpectServerHelloDone(),
+                              ClientKeyExchangeGenerator(),
+                              ChangeCipherSpecGenerator(),
+                              FinishedGenerator(),
+                              ExpectChangeCipherSpec(),
+                              ExpectFinished()])
+
+    return (conversation, node)
+
+
+def build_renego_conv(handshake, ciphers, ext, split_get, no_renego_close):
+    """
+    Create a conversation in which the client tries to renegotiate.
+
+    :param tuple handshake: conversation and its last node with the initial
+        handshake, it is copied, not modified
+    :param list ciphers: cipher suites to send in the renegotiation Client
+        Hello
+    :param dict ext: extensions to send in the renegotiation Client Hello
+    :param bool split_get: send the GET request line before the
+        renegotiation attempt and finish the request only after it,
+        otherwise send the whole request after the renegotiation attempt
+    :param bool no_renego_close: expect the server to close the connection
+        after sending the no_renegotiation alert
+    :return: the conversation
+    """
+    conversation, node = deepcopy(handshake)
+    if split_get:
+        # send incomplete GET request
+        node = node.add_child(ApplicationDataGenerator(GET_REQUEST_LINE))
+    # 2nd handshake
+    node = node.add_children([
+        ResetHandshakeHashes(),
+        ClientHelloGenerator(ciphers, session_id=bytearray(0),
+                             extensions=ext),
+        ExpectAlert(AlertLevel.warning,
+                    AlertDescription.no_renegotiation)])
+    if no_renego_close:
+        node = node.add_children([
+            ExpectAlert(AlertLevel.warning,
+                        AlertDescription.close_notify),
+            ExpectClose()])
+    else:
+        if split_get:
+            # finish the GET request
+            node = node.add_child(ApplicationDataGenerator(GET_REQUEST_END))
+        else:
+            # send GET request
+            node = node.add_child(ApplicationDataGenerator(GET_REQUEST))
+        node = node.add_children([
+            ExpectApplicationData(),
+            AlertGenerator(AlertLevel.warning,
+                           AlertDescription.close_notify),
+            ExpectAlert()])
+        node.next_sibling = ExpectClose()
+
+    return conversation
+
+
 def main():
     host = "localhost"
     port = 4433
@@ -65,9 +192,14 @@ def main():
     no_renego_close = False
     dhe = False
     ciphers = None
+    jobs = 1
+    fast = False
+    verbose = False
 
     argv = sys.argv[1:]
-    opts, args = getopt.getopt(argv, "h:p:e:x:X:n:dC:", ["help", "no-renego-close"])
+    opts, args = getopt.getopt(argv, "h:p:e:x:X:n:dC:v",
+                               ["help", "no-renego-close", "jobs=",
+                                "fast", "verbose"])
     for opt, arg in opts:
         if opt == '-h':
             host = arg
@@ -90,6 +222,12 @@ def main():
             ciphers = [cipher_suite_to_id(arg)]
         elif opt == '--no-renego-close':
             no_renego_close = True
+        elif opt == '--jobs':
+            jobs = int(arg)
+        elif opt == '--fast':
+            fast = True
+        elif opt in ('-v', '--verbose'):
+            verbose = True
         elif opt == '--help':
             help_msg()
             sys.exit(0)
@@ -117,301 +255,36 @@ def main():
 
     conversations = {}
 
-    conversation = Connect(host, port)
-    node = conversation
-    if dhe:
-        ext = {}
-        groups = [GroupName.secp256r1,
-                  GroupName.ffdhe2048]
-        ext[ExtensionType.supported_groups] = SupportedGroupsExtension()\
-            .create(groups)
-        ext[ExtensionType.signature_algorithms] = \
-            SignatureAlgorithmsExtension().create(SIG_ALL)
-        ext[ExtensionType.signature_algorithms_cert] = \
-            SignatureAlgorithmsCertExtension().create(SIG_ALL)
-    else:
-        ext = None
-    node = node.add_child(ClientHelloGenerator(
+    # the initial handshakes are the same in all the conversations, so
+    # create them once and copy them for every conversation
+    secure_handshake = build_conn_graph(host, port, ciphers, dhe, True)
+    insecure_handshake = build_conn_graph(host, port, ciphers, dhe, False)
+    secure_ext = client_hello_extensions(dhe, True)
+    insecure_ext = client_hello_extensions(dhe, False)
+
+    conversation, node = build_conn_graph(
+        host, port,
         ciphers + [CipherSuite.TLS_EMPTY_RENEGOTIATION_INFO_SCSV],
-        extensions=ext))
-    node = node.add_child(ExpectServerHello())
-    node = node.add_child(ExpectCertificate())
-    if dhe:
-        node = node.add_child(ExpectServerKeyExchange())
-    node = node.add_child(ExpectServerHelloDone())
-    node = node.add_child(ClientKeyExchangeGenerator())
-    node = node.add_child(ChangeCipherSpecGenerator())
-    node = node.add_child(FinishedGenerator())
-    node = node.add_child(ExpectChangeCipherSpec())
-    node = node.add_child(ExpectFinished())
-    node = node.add_child(ApplicationDataGenerator(
-        bytearray(b"GET /?Renegotiation_Test=tlsfuzzer HTTP/1.0\r\n\r\n")))
-    node = node.add_child(ExpectApplicationData())
-    node = node.add_child(AlertGenerator(AlertLevel.warning,
-                                         AlertDescription.close_notify))
-    node = node.add_child(ExpectAlert())
+        dhe, False)
+    node = node.add_children([
+        ApplicationDataGenerator(GET_REQUEST),
+        ExpectApplicationData(),
+        AlertGenerator(AlertLevel.warning,
+                       AlertDescription.close_notify),
+        ExpectAlert()])
     node.next_sibling = ExpectClose()
-    conversations["sanity"] = conversation
-
-    # renegotiation
-    conversation = Connect(host, port)
-    node = conversation
-
-    if dhe:
-        ext = {}
-        groups = [GroupName.secp256r1,
-                  GroupName.ffdhe2048]
-        ext[ExtensionType.supported_groups] = SupportedGroupsExtension()\
-            .create(groups)
-        ext[ExtensionType.signature_algorithms] = \
-            SignatureAlgorithmsExtension().create(SIG_ALL)
-        ext[ExtensionType.signature_algorithms_cert] = \
-            SignatureAlgorithmsCertExtension().create(SIG_ALL)
-        ext[ExtensionType.renegotiation_info] = None
-    else:
-        ext = {ExtensionType.renegotiation_info:None}
-    node = node.add_child(ClientHelloGenerator(ciphers, extensions=ext))
-    ext = {ExtensionType.renegotiation_info: None}
-    node = node.add_child(ExpectServerHello(extensions=ext))
-    node = node.add_child(ExpectCertificate())
-    if dhe:
-        node = node.add_child(ExpectServerKeyExchange())
-    node = node.add_child(ExpectServerHelloDone())
-    node = node.add_child(ClientKeyExchangeGenerator())
-    node = node.add_child(ChangeCipherSpecGenerator())
-    node = node.add_child(FinishedGenerator())
-    node = node.add_child(ExpectChangeCipherSpec())
-    node = node.add_child(ExpectFinished())
-    # 2nd handshake
-    node = node.add_child(ResetHandshakeHashes())
-    if dhe:
-        ext = {}
-        groups = [GroupName.secp256r1,
-                  GroupName.ffdhe2048]
-        ext[ExtensionType.supported_groups] = SupportedGroupsExtension()\
-            .create(groups)
-        ext[ExtensionType.signature_algorithms] = \
-            SignatureAlgorithmsExtension().create(SIG_ALL)
-        ext[ExtensionType.signature_algorithms_cert] = \
-            SignatureAlgorithmsCertExtension().create(SIG_ALL)
-        ext[ExtensionType.renegotiation_info] = None
-    else:
-        ext = {ExtensionType.renegotiation_info:None}
-    node = node.add_child(ClientHelloGenerator(ciphers,
-                                               session_id=bytearray(0),
-                                               extensions=ext))
-    node = node.add_child(ExpectAlert(AlertLevel.warning,
-                                      AlertDescription.no_renegotiation))
-    if no_renego_close:
-        node = node.add_child(ExpectAlert(AlertLevel.warning,
-                                          AlertDescription.close_notify))
-        node = node.add_child(ExpectClose())
-    else:
-        # send GET request
-        node = node.add_child(ApplicationDataGenerator(
-            bytearray(b"GET /?Renegotiation_Test=tlsfuzzer HTTP/1.0\r\n")))
-        node = node.add_child(ApplicationDataGenerator(
-            bytearray(b'\r\n')))
-        node = node.add_child(ExpectApplicationData())
-        node = node.add_child(AlertGenerator(AlertLevel.warning,
-                                             AlertDescription.close_notify))
-        node = node.add_child(ExpectAlert())
-        node.next_sibling = ExpectClose()
-    conversations["try secure renegotiation with GET after 2nd CH"] = conversation
-
-    # renegotiation
-    conversation = Connect(host, port)
-    node = conversation
-
-    if dhe:
-        ext = {}
-        groups = [GroupName.secp256r1,
-                  GroupName.ffdhe2048]
-        ext[ExtensionType.supported_groups] = SupportedGroupsExtension()\
-            .create(groups)
-        ext[ExtensionType.signature_algorithms] = \
-            SignatureAlgorithmsExtension().create(SIG_ALL)
-        ext[ExtensionType.signature_algorithms_cert] = \
-            SignatureAlgorithmsCertExtension().create(SIG_ALL)
-        ext[ExtensionType.renegotiation_info] = None
-    else:
-        ext = {ExtensionType.renegotiation_info:None}
-    node = node.add_child(ClientHelloGenerator(ciphers, extensions=ext))
-    ext = {ExtensionType.renegotiation_info: None}
-    node = node.add_child(ExpectServerHello(extensions=ext))
-    node = node.add_child(ExpectCertificate())
-    if dhe:
-        node = node.add_child(ExpectServerKeyExchange())
-    node = node.add_child(ExpectServerHelloDone())
-    node = node.add_child(ClientKeyExchangeGenerator())
-    node = node.add_child(ChangeCipherSpecGenerator())
-    node = node.add_child(FinishedGenerator())
-    node = node.add_child(ExpectChangeCipherSpec())
-    node = node.add_child(ExpectFinished())
-    # send incomplete GET request
-    node = node.add_child(ApplicationDataGenerator(
-        bytearray(b"GET /?Renegotiation_Test=tlsfuzzer HTTP/1.0\r\n")))
-    # 2nd handshake
-    node = node.add_child(ResetHandshakeHashes())
-    if dhe:
-        ext = {}
-        groups = [GroupName.secp256r1,
-                  GroupName.ffdhe2048]
-        ext[ExtensionType.supported_groups] = SupportedGroupsExtension()\
-            .create(groups)
-        ext[ExtensionType.signature_algorithms] = \
-            SignatureAlgorithmsExtension().create(SIG_ALL)
-        ext[ExtensionType.signature_algorithms_cert] = \
-            SignatureAlgorithmsCertExtension().create(SIG_ALL)
-        ext[ExtensionType.renegotiation_info] = None
-    else:
-        ext = {ExtensionType.renegotiation_info:None}
-    node = node.add_child(ClientHelloGenerator(ciphers,
-                                               session_id=bytearray(0),
-                                               extensions=ext))
-    node = node.add_child(ExpectAlert(AlertLevel.warning,
-                                      AlertDescription.no_renegotiation))
-    if no_renego_close:
-        node = node.add_child(ExpectAlert(AlertLevel.warning,
-                                          AlertDescription.close_notify))
-        node = node.add_child(ExpectClose())
-    else:
-        # finish the GET request
-        node = node.add_child(ApplicationDataGenerator(
-            bytearray(b'\r\n')))
-        node = node.add_child(ExpectApplicationData())
-        node = node.add_child(AlertGenerator(AlertLevel.warning,
-                                             AlertDescription.close_notify))
-        node = node.add_child(ExpectAlert())
-        node.next_sibling = ExpectClose()
-    conversations["try secure renegotiation with incomplete GET"] = conversation
+    # kept out of conversations as it's never sampled with the other tests
+    sanity_tests = [("sanity", conversation)]
 
-    # insecure renegotiation
-    conversation = Connect(host, port)
-    node = conversation
-
-    if dhe:
-        ext = {}
-        groups = [GroupName.secp256r1,
-                  GroupName.ffdhe2048]
-        ext[ExtensionType.supported_groups] = SupportedGroupsExtension()\
-            .create(groups)
-        ext[ExtensionType.signature_algorithms] = \
-            SignatureAlgorithmsExtension().create(SIG_ALL)
-        ext[ExtensionType.signature_algorithms_cert] = \
-            SignatureAlgorithmsCertExtension().create(SIG_ALL)
-    else:
-        ext = None
-    node = node.add_child(ClientHelloGenerator(ciphers, extensions=ext))
-    node = node.add_child(ExpectServerHello())
-    node = node.add_child(ExpectCertificate())
-    if dhe:
-        node = node.add_child(ExpectServerKeyExchange())
-    node = node.add_child(ExpectServerHelloDone())
-    node = node.add_child(ClientKeyExchangeGenerator())
-    node = node.add_child(ChangeCipherSpecGenerator())
-    node = node.add_child(FinishedGenerator())
-    node = node.add_child(ExpectChangeCipherSpec())
-    node = node.add_child(ExpectFinished())
-    # 2nd handshake
-    node = node.add_child(ResetHandshakeHashes())
-    if dhe:
-        ext = {}
-        groups = [GroupName.secp256r1,
-                  GroupName.ffdhe2048]
-        ext[ExtensionType.supported_groups] = SupportedGroupsExtension()\
-            .create(groups)
-        ext[ExtensionType.signature_algorithms] = \
-            SignatureAlgorithmsExtension().create(SIG_ALL)
-        ext[ExtensionType.signature_algorithms_cert] = \
-            SignatureAlgorithmsCertExtension().create(SIG_ALL)
-    else:
-        ext = None
-    node = node.add_child(ClientHelloGenerator(ciphers,
-                                               session_id=bytearray(0),
-                                               extensions=ext))
-    node = node.add_child(ExpectAlert(AlertLevel.warning,
-                                      AlertDescription.no_renegotiation))
-    if no_renego_close:
-        node = node.add_child(ExpectAlert(AlertLevel.warning,
-                                          AlertDescription.close_notify))
-        node = node.add_child(ExpectClose())
-    else:
-        # send GET request
-        node = node.add_child(ApplicationDataGenerator(
-            bytearray(b"GET /?Renegotiation_Test=tlsfuzzer HTTP/1.0\r\n")))
-        node = node.add_child(ApplicationDataGenerator(
-            bytearray(b'\r\n')))
-        node = node.add_child(ExpectApplicationData())
-        node = node.add_child(AlertGenerator(AlertLevel.warning,
-                                             AlertDescription.close_notify))
-        node = node.add_child(ExpectAlert())
-        node.next_sibling = ExpectClose()
-    conversations["try insecure (legacy) renegotiation with GET after 2nd CH"] = conversation
-
-    # insecure renegotiation
-    conversation = Connect(host, port)
-    node = conversation
-
-    if dhe:
-        ext = {}
-        groups = [GroupName.secp256r1,
-                  GroupName.ffdhe2048]
-        ext[ExtensionType.supported_groups] = SupportedGroupsExtension()\
-            .create(groups)
-        ext[ExtensionType.signature_algorithms] = \
-            SignatureAlgorithmsExtension().create(SIG_ALL)
-        ext[ExtensionType.signature_algorithms_cert] = \
-            SignatureAlgorithmsCertExtension().create(SIG_ALL)
-    else:
-        ext = None
-    node = node.add_child(ClientHelloGenerator(ciphers, extensions=ext))
-    node = node.add_child(ExpectServerHello())
-    node = node.add_child(ExpectCertificate())
-    if dhe:
-        node = node.add_child(ExpectServerKeyExchange())
-    node = node.add_child(ExpectServerHelloDone())
-    node = node.add_child(ClientKeyExchangeGenerator())
-    node = node.add_child(ChangeCipherSpecGenerator())
-    node = node.add_child(FinishedGenerator())
-    node = node.add_child(ExpectChangeCipherSpec())
-    node = node.add_child(ExpectFinished())
-    # send incomplete GET request
-    node = node.add_child(ApplicationDataGenerator(
-        bytearray(b"GET /?Renegotiation_Test=tlsfuzzer HTTP/1.0\r\n")))
-    # 2nd handshake
-    node = node.add_child(ResetHandshakeHashes())
-    if dhe:
-        ext = {}
-        groups = [GroupName.secp256r1,
-                  GroupName.ffdhe2048]
-        ext[ExtensionType.supported_groups] = SupportedGroupsExtension()\
-            .create(groups)
-        ext[ExtensionType.signature_algorithms] = \
-            SignatureAlgorithmsExtension().create(SIG_ALL)
-        ext[ExtensionType.signature_algorithms_cert] = \
-            SignatureAlgorithmsCertExtension().create(SIG_ALL)
-    else:
-        ext = None
-    node = node.add_child(ClientHelloGenerator(ciphers,
-                                               session_id=bytearray(0),
-                                               extensions=ext))
-    node = node.add_child(ExpectAlert(AlertLevel.warning,
-                                      AlertDescription.no_renegotiation))
-    if no_renego_close:
-        node = node.add_child(ExpectAlert(AlertLevel.warning,
-                                          AlertDescription.close_notify))
-        node = node.add_child(ExpectClose())
-    else:
-        # finish the GET request
-        node = node.add_child(ApplicationDataGenerator(
-            bytearray(b'\r\n')))
-        node = node.add_child(ExpectApplicationData())
-        node = node.add_child(AlertGenerator(AlertLevel.warning,
-                                             AlertDescription.close_notify))
-        node = node.add_child(ExpectAlert())
-        node.next_sibling = ExpectClose()
-    conversations["try insecure (legacy) renegotiation with incomplete GET"] = conversation
+    for renego_name, handshake, renego_ext in (
+            ("secure", secure_handshake, secure_ext),
+            ("insecure (legacy)", insecure_handshake, insecure_ext)):
+        for get_name, split_get in (("GET after 2nd CH", False),
+                                    ("incomplete GET", True)):
+            conversation = build_renego_conv(handshake, ciphers, renego_ext,
+                                             split_get, no_renego_close)
+            conversations["try {0} renegotiation with {1}"
+                          .format(renego_name, get_name)] = conversation
 
 
     # run the conversation
@@ -426,42 +299,57 @@ def main():
 
     # make sure that sanity test is run first and last
     # to verify that server was running and kept running throughout
-    sanity_tests = [('sanity', conversations['sanity'])]
     run_sanity = True
-    if run_only:
-        if len(run_only) == 1 and 'sanity' in run_only:
-            run_sanity = False
-            regular_tests = sanity_tests
-        else:
+    if run_only and len(run_only) == 1 and 'sanity' in run_only:
+        run_sanity = False
+        sampled_tests = sanity_tests
+    else:
+        if run_only:
             if not 'sanity' in run_only:
                 run_sanity = False
-            regular_tests = [(k, v) for k, v in conversations.items() if
-                             k in run_only and (k != 'sanity')]
-    else:
-        regular_tests = [(k, v) for k, v in conversations.items() if
-                         (k != 'sanity') and k not in run_exclude]
-    sampled_tests = sample(regular_tests, min(num_limit, len(regular_tests)))
-    if run_sanity:
-        ordered_tests = chain(sanity_tests, sampled_tests, sanity_tests)
-    else:
-        ordered_tests = sampled_tests
-
-    for c_name, c_test in ordered_tests:
-        if run_only and c_name not in run_only or c_name in run_exclude:
-            continue
-        print("{0} ...".format(c_name))
-
-        runner = Runner(c_test)
-
-        res = True
-        exception = None
-        try:
-            runner.run()
-        except Exception as exp:
-            exception = exp
+            regular_names = [k for k in conversations if k in run_only]
+        else:
+            regular_names = [k for k in conversations if
+                             k not in run_exclude]
+        # sample just the names, to look up only the selected conversations
+        sampled_tests = [(name, conversations[name])
+                         for name in sample(regular_names,
+                                            min(num_limit,
+                                                len(regular_names)))]
+    sanity_runs = []
+    start_time = time.time()
+
+    def test_groups():
+        """Yield the groups of tests in the order they should be run in."""
+        if not run_sanity:
+            yield sampled_tests
+            return
+        sanity_runs.append(sanity_tests)
+        yield sanity_tests
+        yield sampled_tests
+        # with --fast run the final sanity test only if some test failed or
+        # if enough time passed for the server to crash unnoticed
+        if not fast or bad or \
+                time.time() - start_time > FAST_SANITY_TIMEOUT:
+            sanity_runs.append(sanity_tests)
+            yield sanity_tests
+
+    # the groups are run one after another, so that the sanity tests
+    # are not executed in parallel with the other conversations
+    # formatting tracebacks is slow, when the server is down and every
+    # conversation fails, print full tracebacks only for the first few
+    ordered_tests = chain.from_iterable(
+        run_conversations([(c_name, c_test) for c_name, c_test in group
+                           if not (run_only and c_name not in run_only or
+                                   c_name in run_exclude)],
+                          jobs,
+                          lambda: verbose or bad < MAX_TRACEBACKS)
+        for group in test_groups())
+
+    for c_name, res, exception, trace in ordered_tests:
+        if not res:
             print("Error while processing")
-            print(traceback.format_exc())
-            res = False
+            print(trace)
 
         if c_name in expected_failures:
             if res:
@@ -470,7 +358,7 @@ def main():
                 print("XPASS-expected failure but test passed\n")
             else:
                 if expected_failures[c_name] is not None and  \
-                    expected_failures[c_name] not in str(exception):
+                    expected_failures[c_name] not in exception:
                         bad += 1
                         failed.append(c_name)
                         print("Expected error message: {0}\n"
@@ -492,11 +380,10 @@ def main():
     print(20 * '=')
     print("version: {0}".format(version))
     print(20 * '=')
-    if run_sanity:
-        print("TOTAL: {0}".format(len(sampled_tests) + 2 * len(sanity_tests)))
-    else:
-        print("TOTAL: {0}".format(len(sampled_tests)))
-    print("SKIP: {0}".format(len(run_exclude.intersection(conversations.keys()))))
+    print("TOTAL: {0}".format(len(sampled_tests) +
+                             sum(len(i) for i in sanity_runs)))
+    print("SKIP: {0}".format(len(run_exclude.intersection(
+        chain(conversations.keys(), ["sanity"])))))
     print("PASS: {0}".format(good))
     print("XFAIL: {0}".format(xfail))
     print("FAIL: {0}".format(bad))
@@ -112,11 +112,24 @@ Sorted in order of strongest to weakest hash.
 """
 
 
+# names of hash and signature algorithms and their TLS IDs, so that the
+# common case of a named algorithm doesn't need to go through int() first
+_HASH_ALG_IDS = dict((name, val) for name, val in vars(HashAlgorithm).items()
+                     if isinstance(val, int))
+_SIGN_ALG_IDS = dict((name, val) for name, val in
+                     vars(SignatureAlgorithm).items()
+                     if isinstance(val, int))
+
+
 def _hash_name_to_id(h_alg):
     """Try to convert hash algorithm name to HashAlgorithm TLS ID.
 
     accepts also a string with a single number in it
     """
+    try:
+        return _HASH_ALG_IDS[h_alg]
+    except KeyError:
+        pass
     try:
         return int(h_alg)
     except ValueError:
@@ -128,6 +141,10 @@ def _sign_alg_name_to_id(s_alg):
 
     accepts also a string with a single number in it
     """
+    try:
+        return _SIGN_ALG_IDS[s_alg]
+    except KeyError:
+        pass
     try:
         return int(s_alg)
     except ValueError:
@@ -288,6 +305,10 @@ def key_share_gen(group, version=(3, 4), point_format="uncompressed"):
     return KeyShareEntry().create(group, share, private)
 
 
+# sizes of PSK binders (outputs of the HMAC) for supported PSK hashes
+_PSK_BINDER_SIZES = {"sha256": 32, "sha384": 48}
+
+
 def _get_psk_config_hash(psk_settings):
     sett_len = len(psk_settings)
 
@@ -298,7 +319,7 @@ def _get_psk_config_hash(psk_settings):
     else:
         raise ValueError("Invalid number of options in PSK config")
 
-    if psk_hash not in ("sha256", "sha384"):
+    if psk_hash not in _PSK_BINDER_SIZES:
         raise ValueError("Supported hashes are 'sha256' and 'sha384' only")
 
     return psk_hash
@@ -328,7 +349,7 @@ def psk_ext_gen(psk_settings):
 
         psk_hash = _get_psk_config_hash(config)
 
-        binders.append(bytearray(32 if psk_hash == 'sha256' else 48))
+        binders.append(bytearray(_PSK_BINDER_SIZES[psk_hash]))
 
     return PreSharedKeyExtension().create(identities, binders)
 
@@ -497,13 +518,38 @@ class AutoEmptyExtension(object):
     Identifier used to tell ClientHelloGenerator to create empty extension.
     """
 
+    instance = None
+
     def __new__(cls):
         """Return a singleton object."""
-        if not hasattr(cls, 'instance') or not cls.instance:
+        if cls.instance is None:
             cls.instance = object.__new__(cls)
         return cls.instance
 
 
+_PROTOCOL_NAMES = {"sslv2": (0, 2),
+                   "ssl2": (0, 2),
+                   "sslv3": (3, 0),
+                   "ssl3": (3, 0),
+                   "3.0": (3, 0),
+                   "tls 1.0": (3, 1),
+                   "tlsv1.0": (3, 1),
+                   "tls1.0": (3, 1),
+                   "1.0": (3, 1),
+                   "tls 1.1": (3, 2),
+                   "tlsv1.1": (3, 2),
+                   "tls1.1": (3, 2),
+                   "1.1": (3, 2),
+                   "tls 1.2": (3, 3),
+                   "tlsv1.2": (3, 3),
+                   "tls1.2": (3, 3),
+                   "1.2": (3, 3),
+                   "tls 1.3": (3, 4),
+                   "tlsv1.3": (3, 4),
+                   "tls1.3": (3, 4),
+                   "1.3": (3, 4)}
+
+
 def protocol_name_to_tuple(name):
     """
     Translate human readable protocol name ("TLSv1.0") to a tuple representing
@@ -511,33 +557,17 @@ def protocol_name_to_tuple(name):
 
     :raises ValueError: the string was not recognised as a protocol name
     """
-    names = {"sslv2": (0, 2),
-             "ssl2": (0, 2),
-             "sslv3": (3, 0),
-             "ssl3": (3, 0),
-             "3.0": (3, 0),
-             "tls 1.0": (3, 1),
-             "tlsv1.0": (3, 1),
-             "tls1.0": (3, 1),
-             "1.0": (3, 1),
-             "tls 1.1": (3, 2),
-             "tlsv1.1": (3, 2),
-             "tls1.1": (3, 2),
-             "1.1": (3, 2),
-             "tls 1.2": (3, 3),
-             "tlsv1.2": (3, 3),
-             "tls1.2": (3, 3),
-             "1.2": (3, 3),
-             "tls 1.3": (3, 4),
-             "tlsv1.3": (3, 4),
-             "tls1.3": (3, 4),
-             "1.3": (3, 4)}
-    val = names.get(name.lower())
-    if val:
-        return val
+    try:
+        return _PROTOCOL_NAMES[name.lower()]
+    except KeyError:
+        pass
     raise ValueError("Unrecognised protocol name: {0}".format(name))
 
 
+# names of messages that can be used in expected_ext_parser() specification
+_EXT_MSG_NAMES = ('CH', 'SH', 'EE', 'CT', 'CR', 'NST', 'HRR')
+
+
 def expected_ext_parser(names):
     """
     Convert a string with names of extensions and messages to a dict.
@@ -548,13 +578,7 @@ def expected_ext_parser(names):
     AttributeError. The supported message names are: CH, SH, EE, CT, CR, NST
     and HRR.
     """
-    ret = {'CH': [],
-           'SH': [],
-           'EE': [],
-           'CT': [],
-           'CR': [],
-           'NST': [],
-           'HRR': []}
+    ret = dict((msg_id, []) for msg_id in _EXT_MSG_NAMES)
 
     for ext_spec in names.split():
         params = ext_spec.split(':')
@@ -624,5 +648,11 @@ def pad_or_truncate_signature(sig_method, modify, pad_byte=None):
             pad = pad_byte * modify
         return lambda a, b, c, d: bytearray(sig_method(a, b, c, d) + pad)
 
-    return lambda a, b, c, d: bytearray(sig_method(a, b, c, d))[:modify]
+    def truncated_sig(a, b, c, d):
+        # truncate in place, to copy the signature only once
+        ret = bytearray(sig_method(a, b, c, d))
+        del ret[modify:]
+        return ret
+
+    return truncated_sig
 
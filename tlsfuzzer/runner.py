@@ -4,7 +4,14 @@
 
 from __future__ import print_function
 
+import multiprocessing as mp
 import socket
+import sys
+import traceback
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
 from tlslite.messages import Message, Certificate, RecordHeader2
 from tlslite.handshakehashes import HandshakeHashes
 from tlslite.errors import TLSAbruptCloseError
@@ -287,3 +294,102 @@ class Runner(object):
                   " (child: " + str(node.child) + ") with last message " +
                   "being: " + repr(msg))
             raise
+
+
+def run_conversation(conversation, full_traceback=True):
+    """
+    Execute a single conversation.
+
+    :param bool full_traceback: format the full traceback of the error
+    :return: tuple with the result of the run, the message of the raised
+        exception, the exception type with its message and the full
+        traceback (None if the run passed or full_traceback is False)
+    """
+    runner = Runner(conversation)
+    try:
+        runner.run()
+    except Exception as exp:
+        return (False, str(exp),
+                "{0}: {1}".format(type(exp).__name__, exp),
+                traceback.format_exc() if full_traceback else None)
+    return (True, None, None, None)
+
+
+def _run_conversation_captured(conversation):
+    """
+    Execute a single conversation, collecting everything it printed.
+
+    Used in worker processes, so that the output of conversations running
+    in parallel is not interleaved.
+
+    :return: tuple like the one from :py:func:`run_conversation`, with the
+        full traceback always included, and the printed output appended
+    """
+    output = StringIO()
+    old_stdout = sys.stdout
+    sys.stdout = output
+    try:
+        result = run_conversation(conversation)
+    finally:
+        sys.stdout = old_stdout
+    return result + (output.getvalue(), )
+
+
+def _fork_pool(processes):
+    """
+    Create a pool of processes forked from the current one.
+
+    Process start methods other than fork import the main module again
+    in the workers, and the scripts don't guard the call to main() against
+    that.
+
+    :return: the pool or None if fork is not available on the platform
+    """
+    if not hasattr(mp, "get_context"):
+        # Python 2 always forks, except on Windows
+        if sys.platform == "win32":
+            return None
+        return mp.Pool(processes)
+    try:
+        return mp.get_context("fork").Pool(processes)
+    except ValueError:
+        return None
+
+
+def run_conversations(tests, jobs=1, full_traceback=lambda: True):
+    """
+    Execute the conversations, using multiple processes if jobs is above 1.
+
+    Prints the name of every conversation before any output it produced.
+    Runs the conversations one by one if processes can't be forked.
+
+    :param list tests: list of (name, conversation) tuples
+    :param int jobs: number of conversations to run in parallel
+    :param callable full_traceback: returns True if errors should be
+        described with the full traceback instead of just the exception type
+        and message, checked before reporting every failed conversation
+    :return: iterator of (name, result, exception message, error) tuples
+        in the same order as in tests
+    """
+    pool = None
+    if jobs > 1 and len(tests) > 1:
+        pool = _fork_pool(min(jobs, len(tests)))
+    if pool is None:
+        for c_name, c_test in tests:
+            print("{0} ...".format(c_name))
+            res, exception, error, trace = run_conversation(
+                c_test, full_traceback())
+            yield (c_name, res, exception, trace or error)
+        return
+    try:
+        results = pool.imap(_run_conversation_captured,
+                            [c_test for _, c_test in tests])
+        for (c_name, _), result in zip(tests, results):
+            res, exception, error, trace, output = result
+            print("{0} ...".format(c_name))
+            sys.stdout.write(output)
+            yield (c_name, res, exception,
+                   trace if full_traceback() else error)
+    finally:
+        pool.close()
+        pool.join()
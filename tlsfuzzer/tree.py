@@ -20,6 +20,21 @@ class TreeNode(object):
         self.child = child
         return self.child
 
+    def add_children(self, children):
+        """
+        Sets the parameters as a chain of children of the node
+
+        The first element becomes the child of this node, every following
+        element becomes the child of the preceding one.
+
+        :param iterable children: nodes to add
+        :return: the last added node, or this node if no nodes were added
+        """
+        node = self
+        for child in children:
+            node = node.add_child(child)
+        return node
+
     def get_all_siblings(self):
         """
         Return iterator with all siblings of node